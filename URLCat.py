@@ -1,23 +1,52 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urldefrag, urljoin, urlparse, urlunparse
 import re
+import functools
+import threading
 import time
-from collections import defaultdict, Counter
-import nltk
-from textblob import TextBlob
+try:
+    import ahocorasick
+except ImportError:  # Optional speedup; classify_content falls back to a compiled regex
+    ahocorasick = None
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import json
-import base64
+import gzip
+import zlib
+import io
+import xml.etree.ElementTree as ET
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# Keyword extraction: alphabetic tokens of 4+ letters, minus common filler words
+_WORD_RE = re.compile(r"[^\W\d_]{4,}")
+_STOPWORDS = frozenset({
+    'about', 'above', 'after', 'again', 'also', 'been', 'before', 'being', 'below',
+    'both', 'could', 'does', 'doing', 'down', 'during', 'each', 'from', 'further',
+    'have', 'having', 'here', 'into', 'just', 'more', 'most', 'only', 'other',
+    'over', 'same', 'should', 'some', 'such', 'than', 'that', 'their', 'them',
+    'then', 'there', 'these', 'they', 'this', 'those', 'through', 'under', 'until',
+    'very', 'were', 'what', 'when', 'where', 'which', 'while', 'will', 'with',
+    'would', 'your', 'yours'
+})
+
+# Every element extract_page_content reads, matched in a single document-order pass
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+_CONTENT_SELECTOR = ', '.join(('title', 'meta[name="description"]') + _HEADING_TAGS + ('a[href]',))
+
+# Pages are read in chunks and stop downloading at this size. Larger pages, or pages of
+# unknown length, are cached with just the bytes read, since the cache would read the whole body
+MAX_PAGE_BYTES = 512 * 1024
+
+# Sitemaps are plain XML and may be large; cap how much of each, and how many, are read
+MAX_SITEMAP_BYTES = 10 * 1024 * 1024
+MAX_SITEMAPS = 10
 
 # Page configuration
 st.set_page_config(
@@ -33,75 +62,321 @@ if 'analysis_data' not in st.session_state:
 if 'crawled_urls' not in st.session_state:
     st.session_state.crawled_urls = []
 
+class KeywordPresence:
+    """Fallback for installs without pyahocorasick: one str.find per keyword, reporting every
+    keyword found through the same iter() contract as ahocorasick.Automaton"""
+    
+    def __init__(self, keyword_categories):
+        self.values = {keyword: (keyword, tuple(categories)) for keyword, categories in keyword_categories.items()}
+    
+    def iter(self, text):
+        for keyword, value in self.values.items():
+            pos = text.find(keyword)
+            if pos >= 0:
+                yield pos + len(keyword) - 1, value
+
+def build_keyword_automaton(category_keywords):
+    """Build an Aho-Corasick automaton mapping each keyword to the categories it scores"""
+    keyword_categories = defaultdict(list)
+    for category, keywords in category_keywords.items():
+        for keyword in keywords:
+            keyword_categories[keyword].append(category)
+    
+    if ahocorasick is None:
+        return KeywordPresence(keyword_categories)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in keyword_categories.items():
+        automaton.add_word(keyword, (keyword, tuple(categories)))
+    automaton.make_automaton()
+    return automaton
+
+def is_html_response(response):
+    """Whether a response declares an HTML body (a missing Content-Type is given the benefit of the doubt)"""
+    content_type = response.headers.get('Content-Type', '')
+    return not content_type or 'html' in content_type
+
+def is_cacheable_page(response):
+    """Whether the response cache may store a response (HTML with a known length within MAX_PAGE_BYTES)
+    
+    Responses served from the cache pass too, since the cache re-checks them on every hit and
+    would otherwise evict the capped pages download() stores itself.
+    """
+    if getattr(response, 'from_cache', False):
+        return True
+    content_length = response.headers.get('Content-Length', '')
+    return (is_html_response(response) and content_length.isdigit()
+            and int(content_length) <= MAX_PAGE_BYTES)
+
+def read_capped(response, limit=MAX_PAGE_BYTES):
+    """Read a streamed response body, stopping once `limit` bytes have arrived"""
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b''.join(chunks)[:limit]
+
+class CappedReader:
+    """File-like wrapper that reports end-of-file once `limit` bytes have been read"""
+    
+    def __init__(self, raw, limit):
+        self.raw = raw
+        self.remaining = limit
+    
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.raw.read(size)
+        self.remaining -= len(data)
+        return data
+
+def iter_sitemap_locs(content, limit=MAX_SITEMAP_BYTES):
+    """Yield (is_index, loc) for each <loc> in a sitemap or sitemap index document"""
+    source = io.BytesIO(content)
+    if content[:2] == b'\x1f\x8b':  # sitemap.xml.gz - decompress as it is parsed, at most `limit` bytes of it
+        source = CappedReader(gzip.GzipFile(fileobj=source), limit)
+    
+    is_index = None
+    try:
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if event == 'start':
+                if is_index is None:
+                    is_index = tag == 'sitemapindex'
+            elif tag == 'loc':
+                if elem.text and elem.text.strip():
+                    yield is_index, elem.text.strip()
+            elif tag in ('url', 'sitemap'):
+                elem.clear()
+    except (ET.ParseError, EOFError, OSError, zlib.error):
+        return  # Truncated, oversized or malformed - keep whatever was read before the error
+
+@functools.lru_cache(maxsize=65536)
+def parse_url(url):
+    """Memoized urlparse - the same links turn up on page after page"""
+    return urlparse(url)
+
+def normalize_url(url):
+    """Canonicalize a URL so equivalent links collapse to one entry"""
+    parsed = parse_url(url)
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip('/'),
+                       parsed.params, parsed.query, ''))
+
+class HostRateLimiter:
+    """Per-host token bucket: spaces requests to a host at least 1/rps seconds apart"""
+    
+    def __init__(self, rps=5):
+        self.min_gap = 1 / rps
+        self.next_slot = defaultdict(float)
+        self.lock = threading.Lock()
+    
+    def wait(self, host):
+        """Block until the calling thread may send its next request to `host`"""
+        # Reserve a slot under the lock, then sleep outside it so other hosts are not held up
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot[host])
+            self.next_slot[host] = slot + self.min_gap
+        if slot > now:
+            time.sleep(slot - now)
+
 class WebsiteAnalyzer:
-    def __init__(self, base_url, max_pages=50):
+    def __init__(self, base_url, max_pages=50, concurrency=8, requests_per_second=5, use_sitemap=True):
         self.base_url = base_url
         self.max_pages = max_pages
+        self.use_sitemap = use_sitemap
+        self.concurrency = concurrency
+        self.rate_limiter = HostRateLimiter(requests_per_second)
         self.crawled_urls = set()
         self.site_data = []
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlparse(base_url).netloc.lower()
+        self._domain_suffix = '.' + self.domain
+        self.session = self._create_session()
+    
+    def _create_session(self):
+        """Create a pooled HTTP session reused for every page of the crawl.
+        
+        Responses are cached on disk for an hour so re-running an analysis
+        on the same site does not fetch every page again.
+        """
+        session = requests_cache.CachedSession(
+            'urlcat_cache',
+            backend='sqlite',
+            expire_after=3600,
+            allowable_methods=['GET'],
+            filter_fn=is_cacheable_page  # Other pages are stored by download() with their capped body
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        return session
         
     def is_valid_url(self, url):
-        """Check if URL is valid and belongs to the same domain"""
+        """Check if an absolute http(s) URL belongs to the same domain (relative URLs must be resolved first)"""
         try:
-            parsed = urlparse(url)
-            return (parsed.netloc == self.domain or 
-                   parsed.netloc == '' or 
-                   parsed.netloc.endswith('.' + self.domain))
+            parsed = parse_url(url)
+            netloc = parsed.netloc.lower()
+            return (parsed.scheme in ('http', 'https') and
+                   (netloc == self.domain or 
+                    netloc.endswith(self._domain_suffix)))
         except:
             return False
     
-    def extract_page_content(self, url):
-        """Extract content from a single page"""
+    def is_fresh_in_cache(self, url):
+        """Whether a GET of `url` will be answered from the cache without contacting the server"""
+        cache = self.session.cache
+        response = cache.get_response(cache.create_key(Request('GET', url)))
+        return response is not None and not response.is_expired
+    
+    def download(self, url, limit=MAX_PAGE_BYTES, html_only=False):
+        """Download up to `limit` bytes of a URL's body, returning (final URL after redirects, bytes)
+        
+        Raises on any failure.
+        """
+        # Be respectful to the server - fresh cached pages do not touch it, so they skip the wait
+        if not self.is_fresh_in_cache(url):
+            self.rate_limiter.wait(parse_url(url).netloc)
+        
+        response = self.session.get(url, timeout=10, allow_redirects=True, stream=True)
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract basic information
-            title = soup.find('title')
-            title_text = title.text.strip() if title else 'No Title'
+            # Skip PDFs, images, video etc. without downloading them
+            if html_only and not is_html_response(response):
+                raise ValueError(f"non-HTML content ({response.headers['Content-Type']})")
             
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            description = meta_desc.get('content', '') if meta_desc else ''
-            
-            # Extract headings
-            headings = []
-            for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                if h.text.strip():
-                    headings.append(h.text.strip())
-            
-            # Extract text content
-            text_content = soup.get_text()
-            text_content = ' '.join(text_content.split())
+            body = read_capped(response, limit)
+            if html_only and not response.from_cache and not is_cacheable_page(response):
+                self.cache_capped(response, body)
+            return response.url, body
+        finally:
+            response.close()
+    
+    def cache_capped(self, response, body):
+        """Store a page the response cache skipped, keeping only the capped `body` that was read"""
+        if response.status_code != 200:
+            return
+        response._content = body
+        response._content_consumed = True
+        self.session.cache.save_response(
+            response, expires=requests_cache.get_expiration_datetime(self.session.settings.expire_after))
+    
+    def fetch_page(self, url):
+        """Download the HTML body of a single page as (final URL, bytes) - raises on any failure"""
+        return self.download(url, html_only=True)
+    
+    def find_sitemaps(self):
+        """Sitemap URLs declared in robots.txt, or the conventional /sitemap.xml"""
+        try:
+            robots = self.download(urljoin(self.base_url, '/robots.txt'))[1].decode('utf-8', 'replace')
+        except Exception:
+            robots = ''
+        
+        sitemaps = [line.split(':', 1)[1].strip() for line in map(str.strip, robots.splitlines())
+                    if line.lower().startswith('sitemap:')]
+        return sitemaps or [urljoin(self.base_url, '/sitemap.xml')]
+    
+    def discover_sitemap_urls(self):
+        """Collect up to max_pages crawlable page URLs listed in the site's sitemaps"""
+        sitemaps = deque(self.find_sitemaps())
+        fetched = set()
+        urls = {}  # Normalized key -> URL as listed, in sitemap order
+        
+        while sitemaps and len(urls) < self.max_pages and len(fetched) < MAX_SITEMAPS:
+            sitemap_url = sitemaps.popleft()
+            if sitemap_url in fetched:
+                continue
+            fetched.add(sitemap_url)
             
-            # Extract links
-            links = []
-            for link in soup.find_all('a', href=True):
-                href = urljoin(url, link['href'])
-                if self.is_valid_url(href) and href not in links:
+            try:
+                _, content = self.download(sitemap_url, limit=MAX_SITEMAP_BYTES)
+                for is_index, loc in iter_sitemap_locs(content):
+                    if is_index:
+                        sitemaps.append(loc)
+                        continue
+                    if self.is_valid_url(loc):
+                        urls.setdefault(normalize_url(loc), loc)
+                        if len(urls) >= self.max_pages:
+                            break
+            except Exception:
+                continue  # A broken sitemap just contributes nothing
+        
+        return list(urls.values())
+    
+    def parse_page(self, url, final_url, content):
+        """Extract title, description, headings, text and links from raw HTML.
+        
+        Relative links are resolved against `final_url`, the address the page was
+        actually served from after redirects.
+        """
+        tree = HTMLParser(content)
+        
+        # Remove script and style elements
+        tree.strip_tags(['script', 'style'])
+        
+        # Extract title, meta description, headings and links in one walk
+        title_text = None
+        description = None
+        headings = []
+        links = []
+        seen = set()  # Normalized keys, so equivalent spellings of a link collapse
+        for node in tree.css(_CONTENT_SELECTOR):
+            tag = node.tag
+            if tag == 'a':
+                href = urldefrag(urljoin(final_url, node.attributes['href'] or '')).url
+                key = normalize_url(href)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if self.is_valid_url(href):
                     links.append(href)
-            
-            return {
-                'url': url,
-                'title': title_text,
-                'description': description,
-                'headings': headings,
-                'text_content': text_content[:1000],  # Limit text content
-                'word_count': len(text_content.split()),
-                'links': links,
-                'status': 'success'
-            }
-            
+            elif tag == 'title':
+                if title_text is None:
+                    title_text = node.text().strip()
+            elif tag == 'meta':
+                if description is None:
+                    description = node.attributes.get('content') or ''
+            elif tag in _HEADING_TAGS:
+                heading = node.text().strip()
+                if heading:
+                    headings.append(heading)
+        
+        if title_text is None:
+            title_text = 'No Title'
+        if description is None:
+            description = ''
+        
+        # Extract text content
+        root = tree.body or tree.root
+        words = (root.text(separator=' ') if root else '').split()
+        text_content = ' '.join(words)
+        
+        return {
+            'url': url,
+            'title': title_text,
+            'description': description,
+            'headings': headings,
+            'text_content': text_content[:1000],  # Limit text content
+            'word_count': len(words),  # Counted over the whole page, not the stored excerpt
+            'links': links,
+            'status': 'success'
+        }
+    
+    def extract_page_content(self, url):
+        """Extract content from a single page"""
+        try:
+            return self.parse_page(url, *self.fetch_page(url))
         except Exception as e:
             return {
                 'url': url,
@@ -114,30 +389,37 @@ class WebsiteAnalyzer:
                 'status': f'error: {str(e)}'
             }
     
+    _CATEGORY_KEYWORDS = {
+        'product': ['product', 'buy', 'shop', 'store', 'price', 'cart', 'purchase', 'item', 'catalog'],
+        'blog': ['blog', 'post', 'article', 'news', 'story', 'read', 'author', 'published'],
+        'about': ['about', 'company', 'team', 'history', 'mission', 'vision', 'who we are'],
+        'contact': ['contact', 'phone', 'email', 'address', 'location', 'reach us', 'get in touch'],
+        'service': ['service', 'solution', 'consulting', 'support', 'what we do', 'offerings'],
+        'help': ['help', 'faq', 'support', 'documentation', 'guide', 'tutorial', 'how to'],
+        'legal': ['privacy', 'terms', 'legal', 'policy', 'agreement', 'disclaimer', 'cookies']
+    }
+    _KEYWORD_AUTOMATON = build_keyword_automaton(_CATEGORY_KEYWORDS)
+    
     def classify_content(self, content):
         """Simple content classification based on keywords"""
         text = (content['title'] + ' ' + content['description'] + ' ' + 
                 ' '.join(content['headings']) + ' ' + content['text_content']).lower()
         
-        categories = {
-            'product': ['product', 'buy', 'shop', 'store', 'price', 'cart', 'purchase', 'item', 'catalog'],
-            'blog': ['blog', 'post', 'article', 'news', 'story', 'read', 'author', 'published'],
-            'about': ['about', 'company', 'team', 'history', 'mission', 'vision', 'who we are'],
-            'contact': ['contact', 'phone', 'email', 'address', 'location', 'reach us', 'get in touch'],
-            'service': ['service', 'solution', 'consulting', 'support', 'what we do', 'offerings'],
-            'help': ['help', 'faq', 'support', 'documentation', 'guide', 'tutorial', 'how to'],
-            'legal': ['privacy', 'terms', 'legal', 'policy', 'agreement', 'disclaimer', 'cookies']
-        }
-        
-        scores = {}
-        for category, keywords in categories.items():
-            scores[category] = sum(1 for keyword in keywords if keyword in text)
+        # Each distinct keyword found in the text scores once
+        found = set()
+        scores = Counter()
+        for _, match in self._KEYWORD_AUTOMATON.iter(text):
+            if match in found:
+                continue
+            found.add(match)
+            for category in match[1]:
+                scores[category] += 1
         
-        return max(scores, key=scores.get) if max(scores.values()) > 0 else 'other'
+        # Ties go to the earliest category, as before
+        return max(self._CATEGORY_KEYWORDS, key=scores.__getitem__) if scores else 'other'
     
-    def analyze_url_hierarchy(self, url):
-        """Analyze URL structure and hierarchy"""
-        parsed = urlparse(url)
+    def analyze_url_hierarchy(self, parsed):
+        """Analyze URL structure and hierarchy from an already-parsed URL"""
         path_parts = [part for part in parsed.path.split('/') if part]
         
         return {
@@ -147,72 +429,106 @@ class WebsiteAnalyzer:
             'file_extension': path_parts[-1].split('.')[-1] if path_parts and '.' in path_parts[-1] else None
         }
     
+    def analyze_page(self, url):
+        """Fetch, parse and classify a single page - runs on a crawl worker thread"""
+        page_data = self.extract_page_content(url)
+        
+        if page_data['status'] == 'success':
+            # Classify content
+            page_data['category'] = self.classify_content(page_data)
+            
+            # Analyze URL hierarchy
+            page_data['hierarchy'] = self.analyze_url_hierarchy(parse_url(url))
+            
+            # Extract topic keywords (simple version)
+            text = page_data['text_content']
+            if text:
+                # Stream matches straight into the Counter; no intermediate word list
+                words = (match.group().lower() for match in _WORD_RE.finditer(text))
+                page_data['keywords'] = Counter(word for word in words if word not in _STOPWORDS).most_common(5)
+            else:
+                page_data['keywords'] = []
+        
+        return page_data
+    
     def crawl_website(self, progress_callback=None):
-        """Main crawling function"""
-        to_crawl = [self.base_url]
-        crawled = set()
+        """Main crawling function - keeps `concurrency` pages in flight at all times.
         
-        while to_crawl and len(crawled) < self.max_pages:
-            current_url = to_crawl.pop(0)
-            
-            if current_url in crawled:
-                continue
-                
-            crawled.add(current_url)
-            
-            if progress_callback:
-                progress_callback(len(crawled), min(self.max_pages, len(crawled) + len(to_crawl)))
-            
-            page_data = self.extract_page_content(current_url)
-            
-            if page_data['status'] == 'success':
-                # Classify content
-                page_data['category'] = self.classify_content(page_data)
-                
-                # Analyze URL hierarchy
-                page_data['hierarchy'] = self.analyze_url_hierarchy(current_url)
-                
-                # Extract topic keywords (simple version)
-                text = page_data['text_content']
-                if text:
-                    try:
-                        blob = TextBlob(text)
-                        words = [word.lower() for word in blob.words if len(word) > 3 and word.isalpha()]
-                        page_data['keywords'] = Counter(words).most_common(5)
-                    except:
-                        page_data['keywords'] = []
-                else:
-                    page_data['keywords'] = []
-                
-                self.site_data.append(page_data)
-                
-                # Add new URLs to crawl queue
-                for link in page_data['links']:
-                    if link not in crawled and link not in to_crawl:
-                        to_crawl.append(link)
-            
-            time.sleep(0.2)  # Be respectful to the server
+        When the site publishes a sitemap, its URLs are the crawl frontier and links
+        are not followed; otherwise the crawl is a BFS from the base URL.
+        """
+        submitted = 0
+        completed = 0
+        
+        try:
+            sitemap_urls = self.discover_sitemap_urls() if self.use_sitemap else []
+            follow_links = not sitemap_urls
+            
+            to_crawl = deque(sitemap_urls or [self.base_url])
+            # Normalized key of every URL ever queued, so membership checks stay O(1)
+            queued = set(map(normalize_url, to_crawl))
+            
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                in_flight = set()
+                while to_crawl or in_flight:
+                    # Top up the workers as soon as any of them frees up, so parsing one page
+                    # never holds up fetching the next
+                    while to_crawl and len(in_flight) < self.concurrency and submitted < self.max_pages:
+                        in_flight.add(executor.submit(self.analyze_page, to_crawl.popleft()))
+                        submitted += 1
+                    
+                    if not in_flight:
+                        break
+                    
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page_data = future.result()
+                        completed += 1
+                        
+                        if progress_callback:
+                            progress_callback(completed, min(self.max_pages, completed + len(in_flight) + len(to_crawl)))
+                        
+                        if page_data['status'] == 'success':
+                            self.site_data.append(page_data)
+                            
+                            # Add new URLs to crawl queue
+                            for link in page_data['links'] if follow_links else ():
+                                key = normalize_url(link)
+                                if key not in queued:
+                                    queued.add(key)
+                                    to_crawl.append(link)
+        finally:
+            self.session.close()
         
         return self.site_data
 
+@st.cache_data(show_spinner=False)
 def create_taxonomy_data(site_data):
-    """Create taxonomy data for visualization"""
-    taxonomy = {
-        'categories': Counter([page['category'] for page in site_data]),
-        'hierarchy_levels': Counter([page['hierarchy']['depth'] for page in site_data]),
-        'file_types': Counter([page['hierarchy']['file_extension'] or 'html' for page in site_data])
-    }
+    """Create taxonomy data for visualization (cached across Streamlit reruns)"""
+    categories = Counter()
+    hierarchy_levels = Counter()
+    file_types = Counter()
+    topics = Counter()
     
-    # Extract topics from keywords
-    all_keywords = []
+    # Single pass over the pages, updating every counter at once
     for page in site_data:
-        all_keywords.extend([kw[0] for kw in page['keywords']])
-    taxonomy['topics'] = Counter(all_keywords).most_common(10)
+        hierarchy = page['hierarchy']
+        categories[page['category']] += 1
+        hierarchy_levels[hierarchy['depth']] += 1
+        file_types[hierarchy['file_extension'] or 'html'] += 1
+        topics.update(kw[0] for kw in page['keywords'])
     
-    return taxonomy
+    return {
+        'categories': categories,
+        'hierarchy_levels': hierarchy_levels,
+        'file_types': file_types,
+        'topics': topics.most_common(10)
+    }
 
-def create_visualizations(site_data, taxonomy):
-    """Create various visualizations"""
+@st.cache_data(show_spinner=False)
+def build_figures(taxonomy):
+    """Build the overview charts for a taxonomy (cached across Streamlit reruns)"""
+    figures = []
     
     # Category distribution pie chart
     if taxonomy['categories']:
@@ -223,7 +539,7 @@ def create_visualizations(site_data, taxonomy):
             color_discrete_sequence=px.colors.qualitative.Set3
         )
         fig_categories.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_categories, use_container_width=True)
+        figures.append(fig_categories)
     
     # Hierarchy depth bar chart
     if taxonomy['hierarchy_levels']:
@@ -236,7 +552,7 @@ def create_visualizations(site_data, taxonomy):
             color_continuous_scale='Blues'
         )
         fig_hierarchy.update_layout(showlegend=False)
-        st.plotly_chart(fig_hierarchy, use_container_width=True)
+        figures.append(fig_hierarchy)
     
     # Top topics word cloud alternative
     if taxonomy['topics']:
@@ -251,15 +567,37 @@ def create_visualizations(site_data, taxonomy):
             color_continuous_scale='Viridis'
         )
         fig_topics.update_layout(yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig_topics, use_container_width=True)
+        figures.append(fig_topics)
+    
+    return figures
 
-def download_csv(data, filename="website_analysis.csv"):
-    """Create download link for CSV data"""
-    df = pd.DataFrame(data)
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">📥 Download CSV Report</a>'
-    return href
+def create_visualizations(site_data, taxonomy):
+    """Create various visualizations"""
+    for fig in build_figures(taxonomy):
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def build_dataframe(site_data):
+    """Build the per-page analytics table (cached across Streamlit reruns)"""
+    # Flatten the page dicts once (hierarchy.depth -> hierarchy_depth), then derive columns vectorized
+    pages = pd.json_normalize(site_data, sep='_')
+    df = pages[['url', 'title', 'category', 'hierarchy_depth', 'word_count', 'status']].rename(columns={
+        'url': 'URL',
+        'title': 'Title',
+        'category': 'Category',
+        'hierarchy_depth': 'Hierarchy_Depth',
+        'word_count': 'Word_Count',
+        'status': 'Status'
+    })
+    df['Has_Description'] = pages['description'].astype(bool)
+    df['Headings_Count'] = pages['headings'].str.len()
+    df['Links_Count'] = pages['links'].str.len()
+    return df
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df):
+    """Encode a DataFrame as CSV bytes for st.download_button"""
+    return df.to_csv(index=False).encode()
 
 def main():
     st.title("🔍 AI Website Analysis Bot")
@@ -284,6 +622,13 @@ def main():
         help="Limit the number of pages to analyze (recommended: 25-50 for most websites)"
     )
     
+    # Frontier source
+    use_sitemap = st.sidebar.checkbox(
+        "Use sitemap.xml when available",
+        value=True,
+        help="Crawl the pages listed in the site's sitemap instead of following links from the homepage"
+    )
+    
     # Analysis button
     if st.sidebar.button("🚀 Start Analysis", type="primary"):
         if website_url:
@@ -293,7 +638,7 @@ def main():
                     website_url = 'https://' + website_url
                 
                 # Initialize analyzer
-                analyzer = WebsiteAnalyzer(website_url, max_pages)
+                analyzer = WebsiteAnalyzer(website_url, max_pages, use_sitemap=use_sitemap)
                 
                 # Progress tracking
                 progress_bar = st.progress(0)
@@ -454,20 +799,7 @@ def main():
             st.header("📈 Advanced Analytics")
             
             # Create DataFrame for analysis
-            df = pd.DataFrame([
-                {
-                    'URL': page['url'],
-                    'Title': page['title'],
-                    'Category': page['category'],
-                    'Hierarchy_Depth': page['hierarchy']['depth'],
-                    'Word_Count': page['word_count'],
-                    'Status': page['status'],
-                    'Has_Description': bool(page['description']),
-                    'Headings_Count': len(page['headings']),
-                    'Links_Count': len(page['links'])
-                }
-                for page in site_data
-            ])
+            df = build_dataframe(site_data)
             
             # Display raw data table
             st.subheader("📊 Raw Data Table")
@@ -477,18 +809,21 @@ def main():
             st.subheader("📈 Summary Statistics")
             col1, col2 = st.columns(2)
             
+            content_stats = df.agg({'Word_Count': 'mean', 'Has_Description': 'sum', 'Headings_Count': 'mean'})
+            depth_stats = df['Hierarchy_Depth'].agg(['max', 'mean'])
+            
             with col1:
                 st.write("**Content Statistics:**")
                 st.write(f"• Total URLs analyzed: {len(df)}")
-                st.write(f"• Average words per page: {df['Word_Count'].mean():.1f}")
-                st.write(f"• Pages with descriptions: {df['Has_Description'].sum()}")
-                st.write(f"• Average headings per page: {df['Headings_Count'].mean():.1f}")
+                st.write(f"• Average words per page: {content_stats['Word_Count']:.1f}")
+                st.write(f"• Pages with descriptions: {content_stats['Has_Description']:.0f}")
+                st.write(f"• Average headings per page: {content_stats['Headings_Count']:.1f}")
             
             with col2:
                 st.write("**Structure Statistics:**")
-                st.write(f"• Maximum depth: {df['Hierarchy_Depth'].max()}")
-                st.write(f"• Average depth: {df['Hierarchy_Depth'].mean():.1f}")
-                st.write(f"• Pages at root level: {len(df[df['Hierarchy_Depth'] == 0])}")
+                st.write(f"• Maximum depth: {depth_stats['max']:.0f}")
+                st.write(f"• Average depth: {depth_stats['mean']:.1f}")
+                st.write(f"• Pages at root level: {(df['Hierarchy_Depth'] == 0).sum()}")
                 
             # Download options
             st.subheader("📥 Export Options")
@@ -496,18 +831,22 @@ def main():
             col1, col2 = st.columns(2)
             
             with col1:
-                if st.button("📊 Download Full Report (CSV)", type="secondary"):
-                    csv_data = download_csv(df.to_dict('records'))
-                    st.markdown(csv_data, unsafe_allow_html=True)
-                    st.success("✅ CSV download link generated above!")
+                st.download_button(
+                    "📊 Download Full Report (CSV)",
+                    data=to_csv_bytes(df),
+                    file_name="website_analysis.csv",
+                    mime="text/csv",
+                    type="secondary"
+                )
             
             with col2:
-                if st.button("📋 Download URL List (TXT)", type="secondary"):
-                    url_list = '\n'.join([page['url'] for page in site_data])
-                    b64 = base64.b64encode(url_list.encode()).decode()
-                    href = f'<a href="data:text/plain;base64,{b64}" download="url_list.txt">📥 Download URL List</a>'
-                    st.markdown(href, unsafe_allow_html=True)
-                    st.success("✅ URL list download link generated above!")
+                st.download_button(
+                    "📋 Download URL List (TXT)",
+                    data='\n'.join(page['url'] for page in site_data).encode(),
+                    file_name="url_list.txt",
+                    mime="text/plain",
+                    type="secondary"
+                )
     
     # Sidebar info
     st.sidebar.markdown("---")
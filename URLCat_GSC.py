@@ -1,21 +1,45 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 import pandas as pd
 import plotly.express as px
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urldefrag, urljoin, urlparse, urlunparse
 import re
+import functools
+import threading
 import time
-from collections import Counter
-import nltk
-from textblob import TextBlob
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import base64
+import gzip
+import zlib
+import io
+import xml.etree.ElementTree as ET
 
-# Download required NLTK data (silent)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# Keyword extraction: alphabetic tokens of 4+ letters, minus common filler words
+_WORD_RE = re.compile(r"[^\W\d_]{4,}")
+_STOPWORDS = frozenset({
+    'about', 'above', 'after', 'again', 'also', 'been', 'before', 'being', 'below',
+    'both', 'could', 'does', 'doing', 'down', 'during', 'each', 'from', 'further',
+    'have', 'having', 'here', 'into', 'just', 'more', 'most', 'only', 'other',
+    'over', 'same', 'should', 'some', 'such', 'than', 'that', 'their', 'them',
+    'then', 'there', 'these', 'they', 'this', 'those', 'through', 'under', 'until',
+    'very', 'were', 'what', 'when', 'where', 'which', 'while', 'will', 'with',
+    'would', 'your', 'yours'
+})
+
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+_CONTENT_SELECTOR = ', '.join(('title', 'meta[name="description"]') + _HEADING_TAGS + ('a[href]',))
+MAX_PAGE_BYTES = 512 * 1024  # Read cap; larger or unknown-length pages are cached truncated to it
+MAX_SITEMAP_BYTES = 10 * 1024 * 1024
+MAX_SITEMAPS = 10
 
 # Page configuration
 st.set_page_config(
@@ -33,54 +57,250 @@ if 'crawled_urls' not in st.session_state:
 if 'gsc_data' not in st.session_state:
     st.session_state.gsc_data = None
 
+class KeywordPresence:
+    # Fallback for installs without pyahocorasick: same iter() contract as ahocorasick.Automaton
+    def __init__(self, keyword_cats):
+        self.values = {k: (k, tuple(cats)) for k, cats in keyword_cats.items()}
+
+    def iter(self, text):
+        for k, value in self.values.items():
+            pos = text.find(k)
+            if pos >= 0:
+                yield pos + len(k) - 1, value
+
+def build_keyword_automaton(category_keywords):
+    keyword_cats = defaultdict(list)
+    for cat, kws in category_keywords.items():
+        for k in kws:
+            keyword_cats[k].append(cat)
+    if ahocorasick is None:
+        return KeywordPresence(keyword_cats)
+    automaton = ahocorasick.Automaton()
+    for k, cats in keyword_cats.items():
+        automaton.add_word(k, (k, tuple(cats)))
+    automaton.make_automaton()
+    return automaton
+
+def is_html_response(resp):
+    content_type = resp.headers.get("Content-Type", "")
+    return not content_type or "html" in content_type
+
+def is_cacheable_page(resp):
+    # Caching reads the full body, so only HTML whose declared length is within the cap is cached
+    # as it arrives; download() stores the rest with their capped body. Cache hits are re-checked
+    # on every read, so they must pass or those capped pages would be evicted
+    if getattr(resp, "from_cache", False):
+        return True
+    content_length = resp.headers.get("Content-Length", "")
+    return is_html_response(resp) and content_length.isdigit() and int(content_length) <= MAX_PAGE_BYTES
+
+def read_capped(resp, limit=MAX_PAGE_BYTES):
+    chunks, size = [], 0
+    for chunk in resp.iter_content(64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b"".join(chunks)[:limit]
+
+class CappedReader:
+    # Reports end-of-file after `limit` bytes, so a gzip bomb can't inflate without bound
+    def __init__(self, raw, limit):
+        self.raw, self.remaining = raw, limit
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.raw.read(size)
+        self.remaining -= len(data)
+        return data
+
+def iter_sitemap_locs(content, limit=MAX_SITEMAP_BYTES):
+    # Yields (is_index, loc); a sitemapindex lists further sitemaps rather than pages
+    source = io.BytesIO(content)
+    if content[:2] == b"\x1f\x8b":
+        source = CappedReader(gzip.GzipFile(fileobj=source), limit)
+    is_index = None
+    try:
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if is_index is None:
+                    is_index = tag == "sitemapindex"
+            elif tag == "loc":
+                if elem.text and elem.text.strip():
+                    yield is_index, elem.text.strip()
+            elif tag in ("url", "sitemap"):
+                elem.clear()
+    except (ET.ParseError, EOFError, OSError, zlib.error):
+        return
+
+@functools.lru_cache(maxsize=65536)
+def parse_url(url):
+    return urlparse(url)
+
+def normalize_url(url):
+    p = parse_url(url)
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), p.path.rstrip('/'), p.params, p.query, ''))
+
+class HostRateLimiter:
+    def __init__(self, rps=5):
+        self.min_gap = 1 / rps
+        self.next_slot = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def wait(self, host):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot[host])
+            self.next_slot[host] = slot + self.min_gap
+        if slot > now:
+            time.sleep(slot - now)
+
 class WebsiteAnalyzer:
-    def __init__(self, base_url, max_pages=50):
+    def __init__(self, base_url, max_pages=50, concurrency=8, requests_per_second=5, use_sitemap=True):
         self.base_url = base_url.rstrip('/')
         self.max_pages = max_pages
-        self.domain = urlparse(base_url).netloc
+        self.use_sitemap = use_sitemap
+        self.concurrency = concurrency
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.domain = urlparse(base_url).netloc.lower()
+        self._domain_suffix = '.' + self.domain
         self.site_data = []
+        self.session = self._create_session()
+
+    def _create_session(self):
+        session = requests_cache.CachedSession(
+            "urlcat_cache", backend="sqlite", expire_after=3600,
+            allowable_methods=["GET"], filter_fn=is_cacheable_page,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+        return session
 
     def is_valid_url(self, url):
         try:
-            parsed = urlparse(url)
+            parsed = parse_url(url)
+            netloc = parsed.netloc.lower()
             return (
                 parsed.scheme in ("http", "https") and
-                (parsed.netloc == self.domain or parsed.netloc.endswith('.' + self.domain) or parsed.netloc == '')
+                (netloc == self.domain or netloc.endswith(self._domain_suffix) or netloc == '')
             )
         except:
             return False
 
-    def extract_page_content(self, url):
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-        }
+    def is_fresh_in_cache(self, url):
+        # An expired entry still exists in the cache but is refetched, so it must be rate limited
+        cache = self.session.cache
+        response = cache.get_response(cache.create_key(Request("GET", url)))
+        return response is not None and not response.is_expired
+
+    def download(self, url, limit=MAX_PAGE_BYTES, html_only=False):
+        if not self.is_fresh_in_cache(url):
+            self.rate_limiter.wait(parse_url(url).netloc)
+        resp = self.session.get(url, timeout=10, allow_redirects=True, stream=True)
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            for tag in soup(["script", "style", "noscript"]):
-                tag.decompose()
-            title = soup.title.string.strip() if soup.title else "No Title"
-            meta_desc = soup.find("meta", attrs={"name": "description"})
-            description = meta_desc.get("content", "").strip() if meta_desc else ""
-            headings = [h.get_text().strip() for h in soup.find_all(re.compile('^h[1-6]$'))]
-            text_content = ' '.join(soup.get_text().split())[:1000]
-            links = []
-            for a in soup.find_all("a", href=True):
-                href = urljoin(url, a["href"]).split('#')[0]
+            if html_only and not is_html_response(resp):
+                raise ValueError(f"non-HTML content ({resp.headers['Content-Type']})")
+            body = read_capped(resp, limit)
+            if html_only and not resp.from_cache and not is_cacheable_page(resp):
+                self.cache_capped(resp, body)
+            return resp.url, body
+        finally:
+            resp.close()
+
+    def cache_capped(self, resp, body):
+        if resp.status_code != 200:
+            return
+        resp._content, resp._content_consumed = body, True
+        expires = requests_cache.get_expiration_datetime(self.session.settings.expire_after)
+        self.session.cache.save_response(resp, expires=expires)
+
+    def fetch_page(self, url):
+        return self.download(url, html_only=True)
+
+    def find_sitemaps(self):
+        try:
+            robots = self.download(urljoin(self.base_url, "/robots.txt"))[1].decode("utf-8", "replace")
+        except Exception:
+            robots = ""
+        sitemaps = [line.split(":", 1)[1].strip() for line in map(str.strip, robots.splitlines())
+                    if line.lower().startswith("sitemap:")]
+        return sitemaps or [urljoin(self.base_url, "/sitemap.xml")]
+
+    def discover_sitemap_urls(self):
+        sitemaps, fetched, urls = deque(self.find_sitemaps()), set(), {}
+        while sitemaps and len(urls) < self.max_pages and len(fetched) < MAX_SITEMAPS:
+            sitemap_url = sitemaps.popleft()
+            if sitemap_url in fetched:
+                continue
+            fetched.add(sitemap_url)
+            try:
+                for is_index, loc in iter_sitemap_locs(self.download(sitemap_url, limit=MAX_SITEMAP_BYTES)[1]):
+                    if is_index:
+                        sitemaps.append(loc)
+                        continue
+                    if self.is_valid_url(loc):
+                        urls.setdefault(normalize_url(loc), loc)
+                        if len(urls) >= self.max_pages:
+                            break
+            except Exception:
+                continue
+        return list(urls.values())
+
+    def parse_page(self, url, final_url, content):
+        # Links resolve against final_url (post-redirect); normalize_url is only the dedup key
+        tree = HTMLParser(content)
+        tree.strip_tags(["script", "style", "noscript"])
+        title = description = None
+        headings, links, seen = [], [], set()
+        for node in tree.css(_CONTENT_SELECTOR):
+            tag = node.tag
+            if tag == "a":
+                href = urldefrag(urljoin(final_url, node.attributes["href"] or "")).url
+                key = normalize_url(href)
+                if key in seen:
+                    continue
+                seen.add(key)
                 if self.is_valid_url(href):
                     links.append(href)
-            links = list(dict.fromkeys(links))
-            return {
-                "url": url,
-                "title": title,
-                "description": description,
-                "headings": headings,
-                "text_content": text_content,
-                "word_count": len(text_content.split()),
-                "links": links,
-                "status": "success",
-            }
+            elif tag == "title":
+                if title is None:
+                    title = node.text(strip=True)
+            elif tag == "meta":
+                if description is None:
+                    description = (node.attributes.get("content") or "").strip()
+            elif tag in _HEADING_TAGS:
+                headings.append(node.text().strip())
+        title = "No Title" if title is None else title
+        description = description or ""
+        root = tree.body or tree.root
+        words = (root.text(separator=' ') if root else '').split()
+        text_content = ' '.join(words)[:1000]
+        return {
+            "url": url,
+            "title": title,
+            "description": description,
+            "headings": headings,
+            "text_content": text_content,
+            "word_count": len(words),
+            "links": links,
+            "status": "success",
+        }
+
+    def extract_page_content(self, url):
+        try:
+            return self.parse_page(url, *self.fetch_page(url))
         except Exception as e:
             return {
                 "url": url,
@@ -102,50 +322,80 @@ class WebsiteAnalyzer:
         "help": ["help", "faq", "guide", "tutorial"],
         "legal": ["privacy", "terms", "policy", "legal"],
     }
+    _KEYWORD_AUTOMATON = build_keyword_automaton(_CATEGORY_KEYWORDS)
 
     def classify_content(self, page):
         text = " ".join([
             page["title"], page["description"],
             " ".join(page["headings"]), page["text_content"]
         ]).lower()
-        scores = {cat: sum(k in text for k in kws) for cat, kws in self._CATEGORY_KEYWORDS.items()}
-        return max(scores, key=scores.get) if max(scores.values()) > 0 else "other"
+        found, scores = set(), Counter()
+        for _, match in self._KEYWORD_AUTOMATON.iter(text):
+            if match in found:
+                continue
+            found.add(match)
+            for cat in match[1]:
+                scores[cat] += 1
+        return max(self._CATEGORY_KEYWORDS, key=scores.__getitem__) if scores else "other"
 
-    def hierarchy_info(self, url):
-        parsed = urlparse(url)
+    def hierarchy_info(self, parsed):
         parts = [p for p in parsed.path.split("/") if p]
         return {
             "depth": len(parts),
             "file_ext": parts[-1].split(".")[-1] if parts and "." in parts[-1] else "html"
         }
 
+    def analyze_page(self, url):
+        # Runs on a crawl worker thread: fetch, parse and classify in one go
+        page = self.extract_page_content(url)
+        if page["status"] == "success":
+            page["category"] = self.classify_content(page)
+            page["hierarchy"] = self.hierarchy_info(parse_url(url))
+            words = (m.group().lower() for m in _WORD_RE.finditer(page["text_content"]))
+            page["keywords"] = Counter(w for w in words if w not in _STOPWORDS).most_common(5)
+        return page
+
     def crawl(self, callback=None):
-        todo, done = [self.base_url], set()
-        while todo and len(done) < self.max_pages:
-            current = todo.pop(0)
-            if current in done: continue
-            done.add(current)
-            if callback: callback(len(done), min(self.max_pages, len(done)+len(todo)))
-            page = self.extract_page_content(current)
-            if page["status"] == "success":
-                page["category"] = self.classify_content(page)
-                page["hierarchy"] = self.hierarchy_info(current)
-                blob = TextBlob(page["text_content"])
-                words = [w.lower() for w in blob.words if w.isalpha() and len(w)>3]
-                page["keywords"] = Counter(words).most_common(5)
-                self.site_data.append(page)
-                for link in page["links"]:
-                    if link not in done and link not in todo and len(done)+len(todo)<self.max_pages:
-                        todo.append(link)
-            time.sleep(0.15)
+        submitted = completed = 0
+        try:
+            # Prefer the sitemap as the frontier; only BFS through links when there is none
+            sitemap_urls = self.discover_sitemap_urls() if self.use_sitemap else []
+            follow_links = not sitemap_urls
+            todo = deque(sitemap_urls or [self.base_url])
+            queued = set(map(normalize_url, todo))
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                in_flight = set()
+                while todo or in_flight:
+                    # Refill free workers right away rather than waiting for a whole wave
+                    while todo and len(in_flight) < self.concurrency and submitted < self.max_pages:
+                        in_flight.add(pool.submit(self.analyze_page, todo.popleft()))
+                        submitted += 1
+                    if not in_flight:
+                        break
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        page = future.result()
+                        completed += 1
+                        if callback: callback(completed, min(self.max_pages, completed+len(in_flight)+len(todo)))
+                        if page["status"] == "success":
+                            self.site_data.append(page)
+                            for link in page["links"] if follow_links else ():
+                                key = normalize_url(link)
+                                if key not in queued and submitted+len(todo)<self.max_pages:
+                                    queued.add(key)
+                                    todo.append(link)
+        finally:
+            self.session.close()
         return self.site_data
 
+@st.cache_data(show_spinner=False)
 def build_taxonomy(data):
-    return {
-        "categories": Counter(d["category"] for d in data),
-        "depth": Counter(d["hierarchy"]["depth"] for d in data),
-        "file_types": Counter(d["hierarchy"]["file_ext"] for d in data)
-    }
+    categories, depth, file_types = Counter(), Counter(), Counter()
+    for d in data:
+        categories[d["category"]] += 1
+        depth[d["hierarchy"]["depth"]] += 1
+        file_types[d["hierarchy"]["file_ext"]] += 1
+    return {"categories": categories, "depth": depth, "file_types": file_types}
 
 def csv_download_link(df, label, filename):
     csv = df.to_csv(index=False)